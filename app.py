@@ -1,18 +1,41 @@
 import streamlit as st
-import json
+import functools
+import heapq
+import orjson
 import os
+import tempfile
 from datetime import datetime, date, time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import time as time_module
+import numpy as np
 import pytz
 
 # Configuration
 # Use absolute path to ensure data.json is always in the same directory as app.py
 DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.json")
+# Set TIME_GUESS_PRETTY=1 to write indented JSON for local debugging
+JSON_OPTIONS = orjson.OPT_INDENT_2 if os.environ.get("TIME_GUESS_PRETTY") == "1" else 0
 FRIENDS = ["Honor", "Dawn", "Pilgrim"]
+FRIENDS_SET = frozenset(FRIENDS)
+EASTERN = pytz.timezone('US/Eastern')
+# Column code for each friend in the leaderboard's name array
+FRIEND_CODES = {friend: code for code, friend in enumerate(FRIENDS)}
+_ZERO_WINS = {friend: 0 for friend in FRIENDS}
+
+def _data_file_key() -> Optional[Tuple[int, int]]:
+    """Freshness key for data.json as (mtime in ns, size), None if missing"""
+    try:
+        stat_result = os.stat(DATA_FILE)
+    except FileNotFoundError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
 
 def load_data() -> Dict:
     """Load data from JSON file, create empty structure if file doesn't exist"""
+    return _load_data_keyed()[0]
+
+def _load_data_keyed() -> Tuple[Dict, Tuple[int, int]]:
+    """Load data along with the freshness key of the file it came from"""
     # Historical dates
     july_31 = "2025-07-31"  # Honor won
     aug_2 = "2025-08-02"    # Pilgrim won (last Friday)
@@ -35,65 +58,168 @@ def load_data() -> Dict:
         "initial_scores": {"Honor": 0, "Dawn": 0, "Pilgrim": 0}
     }
     
-    if not os.path.exists(DATA_FILE):
+    # Stat before reading: if the file is replaced in between, the key is
+    # simply stale and the next check reloads, rather than the reverse
+    key = _data_file_key()
+    if key is None:
         # Create initial data file with existing scores
-        save_data(default_data)
-        return default_data
+        return default_data, save_data(default_data)
     
     try:
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
-            # Ensure initial_scores exists in loaded data
-            if "initial_scores" not in data:
-                data["initial_scores"] = {"Honor": 0, "Dawn": 0, "Pilgrim": 0}
-                save_data(data)
-            return data
-    except (json.JSONDecodeError, FileNotFoundError):
-        save_data(default_data)
-        return default_data
+        data = _load_data_cached(key)
+        # Ensure initial_scores exists in loaded data
+        if "initial_scores" not in data:
+            data["initial_scores"] = {"Honor": 0, "Dawn": 0, "Pilgrim": 0}
+            key = save_data(data)
+        return data, key
+    except (orjson.JSONDecodeError, FileNotFoundError):
+        return default_data, save_data(default_data)
+
+@st.cache_data(show_spinner=False)
+def _load_data_cached(key: Tuple[int, int]) -> Dict:
+    """Read and parse the JSON file; cached per file freshness key"""
+    with open(DATA_FILE, 'rb') as f:
+        return orjson.loads(f.read())
+
+def get_session_data() -> Tuple[Dict, Tuple[int, int]]:
+    """Reuse this session's loaded data until data.json changes on disk"""
+    key = _data_file_key()
+    if key is None or st.session_state.get("data_key") != key:
+        data, key = _load_data_keyed()
+        st.session_state["data"] = data
+        st.session_state["data_key"] = key
+    return st.session_state["data"], st.session_state["data_key"]
 
-def save_data(data: Dict) -> None:
-    """Save data to JSON file"""
+@functools.lru_cache(maxsize=1)
+def _umask() -> int:
+    """Process umask, read once (os.umask can only be read by setting it)"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+def _data_file_mode() -> int:
+    """Permission bits for a rewrite: the existing file's, else what open() would give"""
+    try:
+        return os.stat(DATA_FILE).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+def save_data(data: Dict) -> Tuple[int, int]:
+    """Save data to JSON file and return the freshness key of what was written"""
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write a per-save temp file and swap it in so concurrent sessions
+        # never share a temp file and readers never see a partial data.json
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(DATA_FILE), prefix="data.json.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(data, option=JSON_OPTIONS))
+                f.flush()
+                os.fsync(f.fileno())
+                # Key of exactly these bytes; os.replace keeps mtime and size
+                stat_result = os.fstat(f.fileno())
+            # mkstemp creates the file owner-only; give it data.json's mode
+            os.chmod(tmp_file, _data_file_mode())
+            os.replace(tmp_file, DATA_FILE)
+            key = (stat_result.st_mtime_ns, stat_result.st_size)
+        except Exception:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        # This session's copy now matches the file; no need to re-read it
+        if st.session_state.get("data") is data:
+            st.session_state["data_key"] = key
         # Verify the file was actually written
         if os.path.exists(DATA_FILE):
             file_size = os.path.getsize(DATA_FILE)
             print(f"DEBUG: Data saved successfully to {DATA_FILE} ({file_size} bytes)")
         else:
             print(f"ERROR: File {DATA_FILE} was not created after save attempt")
+        return key
     except Exception as e:
         print(f"ERROR saving data: {e}")
+        # The session copy may hold unsaved edits; force a reload
+        st.session_state.pop("data_key", None)
         raise
+    finally:
+        # Drop cached reads so the next load picks up this write
+        _load_data_cached.clear()
+        _leaderboard_cached.clear()
+
+@functools.lru_cache(maxsize=1)
+def _today_string_at(second: int) -> str:
+    """Today's date string, memoized for the given wall-clock second"""
+    return date.today().strftime("%Y-%m-%d")
 
 def get_today_string() -> str:
     """Get today's date as string in YYYY-MM-DD format"""
-    return date.today().strftime("%Y-%m-%d")
+    return _today_string_at(int(time_module.time()))
 
-def get_today_guesses(data: Dict) -> List[Dict]:
-    """Get all guesses for today's date"""
-    today = get_today_string()
-    return [guess for guess in data["guesses"] if guess["date"] == today]
+def _today_view(data: Dict, today: str) -> Tuple[List[Dict], Optional[Dict], Dict[str, Dict]]:
+    """Today's guesses, actual time entry and guesses by name, in one pass per list"""
+    today_guesses = []
+    today_by_name = {}
+    for guess in data["guesses"]:
+        if guess["date"] == today:
+            today_guesses.append(guess)
+            today_by_name[guess["name"]] = guess
+    
+    today_actual = None
+    for entry in data["actual_times"]:
+        if entry["date"] == today:
+            today_actual = entry
+            break
+    
+    return today_guesses, today_actual, today_by_name
 
-def get_today_actual_time(data: Dict) -> Optional[Dict]:
-    """Get actual time entry for today's date"""
-    today = get_today_string()
-    actual_times = [entry for entry in data["actual_times"] if entry["date"] == today]
-    return actual_times[0] if actual_times else None
+def _parse_hhmm(time_str: str) -> Optional[int]:
+    """Parse an HH:MM (or H:MM) string to minutes since midnight, None if invalid"""
+    if not isinstance(time_str, str):
+        # Hand-edited data.json may hold null or numbers
+        return None
+    if len(time_str) == 4:
+        time_str = "0" + time_str
+    if len(time_str) != 5 or time_str[2] != ':':
+        return None
+    digits = time_str[:2] + time_str[3:]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    hours = (ord(time_str[0]) - 48) * 10 + (ord(time_str[1]) - 48)
+    minutes = (ord(time_str[3]) - 48) * 10 + (ord(time_str[4]) - 48)
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
 
 def time_to_minutes(time_str: str) -> int:
     """Convert HH:MM time string to minutes since midnight"""
+    minutes = _parse_hhmm(time_str)
+    if minutes is not None:
+        return minutes
+    # Slow path for loosely formatted legacy entries (e.g. "17:5")
     try:
         hours, minutes = map(int, time_str.split(':'))
         return hours * 60 + minutes
     except:
         return 0
 
+def times_to_minutes(time_strs: List[str]) -> np.ndarray:
+    """Convert a batch of HH:MM time strings to minutes since midnight"""
+    if not time_strs:
+        return np.zeros(0, dtype=np.int64)
+    parts = np.char.partition(np.array(time_strs, dtype=str), ":")
+    hours, minutes = parts[:, 0], parts[:, 2]
+    # Up to 9 characters per field cannot overflow int64 once combined
+    if np.char.str_len(hours).max() <= 9 and np.char.str_len(minutes).max() <= 9:
+        try:
+            return hours.astype(np.int64) * 60 + minutes.astype(np.int64)
+        except ValueError:
+            pass
+    # Malformed or oversized entries: fall back to the per-item parser, whose
+    # Python ints never wrap (NumPy keeps them exact, as object if need be)
+    return np.array([time_to_minutes(t) for t in time_strs])
+
 def get_eastern_time() -> datetime:
     """Get current time in Eastern timezone (handles EST/EDT automatically)"""
-    eastern = pytz.timezone('US/Eastern')
-    return datetime.now(eastern)
+    return datetime.now(EASTERN)
 
 def is_guess_deadline_passed() -> bool:
     """Check if the 12:00 PM EST/EDT deadline for guesses has passed today"""
@@ -119,77 +245,98 @@ def get_time_until_deadline() -> Dict[str, int]:
     
     return {"hours": hours, "minutes": minutes, "seconds": seconds, "passed": False}
 
-def get_user_guess(data: Dict, friend_name: str, today: str) -> Optional[Dict]:
-    """Get a specific friend's guess for today"""
-    for guess in data["guesses"]:
-        if guess["date"] == today and guess["name"] == friend_name:
-            return guess
-    return None
-
-def update_user_guess(data: Dict, friend_name: str, today: str, new_guess: str) -> None:
+def update_user_guess(data: Dict, today_by_name: Dict[str, Dict], friend_name: str, today: str, new_guess: str) -> None:
     """Update or add a friend's guess for today"""
-    # Remove existing guess if any
-    data["guesses"] = [g for g in data["guesses"] if not (g["date"] == today and g["name"] == friend_name)]
+    existing_guess = today_by_name.get(friend_name)
+    if existing_guess:
+        # Same dict as in data["guesses"], so the saved list sees the change
+        existing_guess["guess_time"] = new_guess
+        return
     
     # Add new guess
-    data["guesses"].append({
+    guess = {
         "date": today,
         "name": friend_name,
         "guess_time": new_guess
-    })
+    }
+    data["guesses"].append(guess)
+    today_by_name[friend_name] = guess
 
 def calculate_leaderboard(data: Dict) -> Dict[str, int]:
     """Calculate leaderboard showing wins for each friend across all days"""
     # Start with initial scores
-    wins = data.get("initial_scores", {friend: 0 for friend in FRIENDS}).copy()
+    wins = dict(data.get("initial_scores") or _ZERO_WINS)
     
-    # Group data by date
-    dates_with_complete_data = set()
+    # Latest guess time per friend for each date, in one pass
+    guess_times_by_date: Dict[str, Dict[str, str]] = {}
+    for guess in data["guesses"]:
+        date_guesses = guess_times_by_date.get(guess["date"])
+        if date_guesses is None:
+            # Allocate one map per date, not a throwaway {} per guess
+            date_guesses = guess_times_by_date[guess["date"]] = {}
+        date_guesses[guess["name"]] = guess["guess_time"]
+    actuals_by_date: Dict[str, Dict] = {}
+    for entry in data["actual_times"]:
+        # Keep the first actual time recorded for a date
+        actuals_by_date.setdefault(entry["date"], entry)
     
-    # Find dates that have both all guesses and actual time
-    for actual_entry in data["actual_times"]:
-        date_str = actual_entry["date"]
-        date_guesses = [g for g in data["guesses"] if g["date"] == date_str]
+    # Collect every complete date's guesses into flat, date-contiguous columns
+    name_codes: List[int] = []
+    guess_times: List[str] = []
+    actual_times: List[str] = []
+    group_starts: List[int] = []
+    for date_str, actual_entry in actuals_by_date.items():
+        # Check if exactly the friends have guessed for this date
+        date_guesses = guess_times_by_date.get(date_str)
+        if date_guesses is None or date_guesses.keys() != FRIENDS_SET:
+            continue
         
-        # Check if all friends have guessed for this date
-        guessed_friends = {g["name"] for g in date_guesses}
-        if len(guessed_friends) == len(FRIENDS) and all(friend in guessed_friends for friend in FRIENDS):
-            dates_with_complete_data.add(date_str)
-    
-    # Calculate winners for each complete date
-    for date_str in dates_with_complete_data:
-        actual_entry = next(entry for entry in data["actual_times"] if entry["date"] == date_str)
-        actual_minutes = time_to_minutes(actual_entry["actual_time"])
-        
-        date_guesses = [g for g in data["guesses"] if g["date"] == date_str]
-        
-        # Calculate differences for each friend
-        differences = {}
-        for guess in date_guesses:
-            guess_minutes = time_to_minutes(guess["guess_time"])
-            diff = abs(actual_minutes - guess_minutes)
-            differences[guess["name"]] = diff
-        
-        # Find all winners (closest guess - handle ties)
-        if differences:
-            min_difference = min(differences.values())
-            winners = [name for name, diff in differences.items() if diff == min_difference]
-            # Award 1 point to each person with the closest guess
-            for winner in winners:
-                wins[winner] += 1
+        group_starts.append(len(name_codes))
+        name_codes.extend(FRIEND_CODES[name] for name in date_guesses)
+        guess_times.extend(date_guesses.values())
+        actual_times.append(actual_entry["actual_time"])
+    
+    if not group_starts:
+        return wins
+    
+    # Differences for all dates at once, then the closest difference per date
+    group_sizes = np.diff(group_starts + [len(name_codes)])
+    actual_minutes = np.repeat(times_to_minutes(actual_times), group_sizes)
+    differences = np.abs(times_to_minutes(guess_times) - actual_minutes)
+    best = np.repeat(np.minimum.reduceat(differences, group_starts), group_sizes)
+    
+    # Award 1 point to each person with the closest guess (ties all score)
+    winner_codes = np.array(name_codes, dtype=np.int8)[differences == best]
+    for friend, count in zip(FRIENDS, np.bincount(winner_codes, minlength=len(FRIENDS))):
+        if count:
+            wins[friend] += int(count)
     
     return wins
 
+@st.cache_data(show_spinner=False)
+def _leaderboard_cached(key: Tuple[int, int], _data: Dict) -> Dict[str, int]:
+    """Leaderboard for data loaded at the given freshness key (_data is not hashed)"""
+    return calculate_leaderboard(_data)
+
 def reset_today_data() -> None:
     """Remove today's entries from data.json"""
     data = load_data()
     today = get_today_string()
     
+    # Today's entries are appended last, so scan from the end
+    has_guesses = any(guess["date"] == today for guess in reversed(data["guesses"]))
+    has_actual = any(entry["date"] == today for entry in reversed(data["actual_times"]))
+    if not (has_guesses or has_actual):
+        # Nothing to remove; skip rebuilding the lists and rewriting the file
+        return
+    
     # Remove today's guesses
-    data["guesses"] = [guess for guess in data["guesses"] if guess["date"] != today]
+    if has_guesses:
+        data["guesses"] = [guess for guess in data["guesses"] if guess["date"] != today]
     
     # Remove today's actual time
-    data["actual_times"] = [entry for entry in data["actual_times"] if entry["date"] != today]
+    if has_actual:
+        data["actual_times"] = [entry for entry in data["actual_times"] if entry["date"] != today]
     
     save_data(data)
 
@@ -197,9 +344,9 @@ def main():
     st.set_page_config(page_title="Rat Office Time Guess", page_icon="🐭")
     
     # Load data
-    data = load_data()
-    today_guesses = get_today_guesses(data)
-    today_actual = get_today_actual_time(data)
+    data, data_key = get_session_data()
+    today = get_today_string()
+    today_guesses, today_actual, today_by_name = _today_view(data, today)
     
     # Main headline - show until all friends have guessed
     if len(today_guesses) < len(FRIENDS):
@@ -209,7 +356,7 @@ def main():
     
     # Show current date and Eastern time
     eastern_time = get_eastern_time()
-    st.write(f"**Date:** {get_today_string()}")
+    st.write(f"**Date:** {today}")
     st.write(f"**Current Eastern Time:** {eastern_time.strftime('%I:%M:%S %p %Z')}")
     
     # Show countdown timer
@@ -226,42 +373,40 @@ def main():
     
     # Check if deadline has passed
     deadline_passed = is_guess_deadline_passed()
-    today = get_today_string()
     
     if not deadline_passed:
         # Show input fields for all friends to submit/update guesses
         st.write("Enter or update your guess for when the rat will leave (HH:MM format):")
         
-        for friend in FRIENDS:
-            existing_guess = get_user_guess(data, friend, today)
-            current_guess = existing_guess["guess_time"] if existing_guess else ""
-            
-            with st.form(f"guess_form_{friend}"):
-                st.subheader(f"{friend}")
-                if existing_guess:
-                    st.write(f"Current guess: **{current_guess}**")
-                
-                new_guess = st.text_input(
-                    "New guess:",
-                    value=current_guess,
+        current_guesses = {name: guess["guess_time"] for name, guess in today_by_name.items()}
+        
+        with st.form("guess_form"):
+            new_guesses = {
+                friend: st.text_input(
+                    f"{friend}:",
+                    value=current_guesses.get(friend, ""),
                     placeholder="HH:MM (e.g., 17:30)",
                     key=f"guess_input_{friend}"
                 )
-                
-                action_text = "Update Guess" if existing_guess else "Submit Guess"
-                submitted = st.form_submit_button(action_text)
-                
-                if submitted and new_guess:
-                    # Validate time format
-                    try:
-                        datetime.strptime(new_guess, "%H:%M")
-                        update_user_guess(data, friend, today, new_guess)
-                        save_data(data)
-                        action = "updated" if existing_guess else "submitted"
-                        st.success(f"{friend}'s guess {action} successfully!")
-                        st.rerun()
-                    except ValueError:
-                        st.error(f"Invalid time format. Please use HH:MM format.")
+                for friend in FRIENDS
+            }
+            submitted = st.form_submit_button("Submit Guesses")
+        
+        if submitted:
+            # Only entries that were filled in and differ from the saved guess
+            changed = {
+                friend: guess for friend, guess in new_guesses.items()
+                if guess and guess != current_guesses.get(friend)
+            }
+            invalid = [friend for friend, guess in changed.items() if _parse_hhmm(guess) is None]
+            if invalid:
+                st.error(f"Invalid time format for {', '.join(invalid)}. Please use HH:MM format.")
+            elif changed:
+                for friend, guess in changed.items():
+                    update_user_guess(data, today_by_name, friend, today, guess)
+                save_data(data)
+                st.success(f"Guesses saved for {', '.join(changed)}!")
+                st.rerun()
     else:
         st.write("⏰ **Guess submission deadline has passed for today (12:00 PM EST/EDT).**")
     
@@ -273,7 +418,8 @@ def main():
     
     # Always show leaderboard
     st.header("📊 Overall Leaderboard")
-    leaderboard = calculate_leaderboard(data)
+    # Only recomputed when data.json changes; drawn from the same data as the page
+    leaderboard = _leaderboard_cached(data_key, data)
     
     # Sort by wins (descending)
     sorted_leaderboard = sorted(leaderboard.items(), key=lambda x: x[1], reverse=True)
@@ -296,20 +442,17 @@ def main():
             
             if submitted_actual and actual_time:
                 # Validate time format
-                try:
-                    datetime.strptime(actual_time, "%H:%M")
-                    
+                if _parse_hhmm(actual_time) is None:
+                    st.error("Invalid time format. Please use HH:MM format.")
+                else:
                     # Save actual time
                     data["actual_times"].append({
-                        "date": get_today_string(),
+                        "date": today,
                         "actual_time": actual_time
                     })
                     save_data(data)
                     st.success("Actual time recorded!")
                     st.rerun()
-                    
-                except ValueError:
-                    st.error("Invalid time format. Please use HH:MM format.")
     
     # Section 3: Results and Leaderboard (show after actual time is recorded)
     if today_actual:
@@ -329,8 +472,8 @@ def main():
                 "difference": diff_minutes
             })
         
-        # Sort by difference (closest first)
-        differences.sort(key=lambda x: x["difference"])
+        # Closest first; only the podium places are ranked
+        differences = heapq.nsmallest(len(FRIENDS), differences, key=lambda x: x["difference"])
         
         st.subheader("Today's Rankings:")
         for i, result in enumerate(differences):
@@ -352,8 +495,7 @@ def main():
         cols = st.columns(len(FRIENDS))
         for i, friend in enumerate(FRIENDS):
             with cols[i]:
-                existing_guess = get_user_guess(data, friend, today)
-                if existing_guess:
+                if friend in today_by_name:
                     if st.button(f"Reset {friend}", key=f"reset_{friend}"):
                         # Remove this friend's guess
                         data["guesses"] = [g for g in data["guesses"] if not (g["date"] == today and g["name"] == friend)]
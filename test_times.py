@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the HH:MM parsers agree and reject bad input
+"""
+from app import _parse_hhmm, calculate_leaderboard, time_to_minutes, times_to_minutes
+
+# Valid, loosely formatted, malformed and out-of-range legacy values
+TIMES = [
+    "00:00", "09:05", "16:10", "23:59", "9:30", "17:5",
+    "24:00", "99:99", "999:00", "-1:30", "ab:cd", "", "12:3a",
+    "99999999999:00", "12345678901234567890:00",
+    # Non-strings from a hand-edited data.json
+    None, 1030,
+]
+
+def test_parse_hhmm():
+    assert _parse_hhmm("00:00") == 0
+    assert _parse_hhmm("23:59") == 1439
+    assert _parse_hhmm("9:30") == 570
+    for bad in ["24:00", "12:60", "17:5", "ab:cd", "", "12:3a", "17:30 ", None, 1030, 17.5]:
+        assert _parse_hhmm(bad) is None, bad
+
+def test_times_to_minutes_matches_time_to_minutes():
+    # Each value on its own, so one malformed entry doesn't force the fallback for all
+    for time_str in TIMES:
+        assert times_to_minutes([time_str]).tolist() == [time_to_minutes(time_str)], time_str
+
+def test_times_to_minutes_batch():
+    valid = ["00:00", "09:05", "16:10", "23:59", "9:30", "999:00"]
+    assert times_to_minutes(valid).tolist() == [time_to_minutes(t) for t in valid]
+    assert times_to_minutes(TIMES).tolist() == [time_to_minutes(t) for t in TIMES]
+    assert times_to_minutes([]).tolist() == []
+
+def test_leaderboard_tolerates_non_string_times():
+    data = {
+        "guesses": [
+            {"date": "2025-07-31", "name": "Honor", "guess_time": None},
+            {"date": "2025-07-31", "name": "Dawn", "guess_time": 1030},
+            {"date": "2025-07-31", "name": "Pilgrim", "guess_time": "00:10"},
+        ],
+        "actual_times": [{"date": "2025-07-31", "actual_time": "00:00"}],
+        "initial_scores": {"Honor": 0, "Dawn": 0, "Pilgrim": 0},
+    }
+    # Non-strings count as 00:00, as before
+    assert calculate_leaderboard(data) == {"Honor": 1, "Dawn": 1, "Pilgrim": 0}
+
+if __name__ == "__main__":
+    test_parse_hhmm()
+    test_times_to_minutes_matches_time_to_minutes()
+    test_times_to_minutes_batch()
+    test_leaderboard_tolerates_non_string_times()
+    print("✅ HH:MM parsers agree and reject bad input")